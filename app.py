@@ -1,12 +1,97 @@
+import hashlib
+import io
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
+
+try:
+  import python_calamine  # noqa: F401
+  XLSX_ENGINE = "calamine"
+except ImportError:
+  # Fall back to openpyxl where the calamine wheel is unavailable (e.g. under stlite/Pyodide)
+  XLSX_ENGINE = "openpyxl"
+
+# TOU rates per half-hour slot (00:00 = slot 0, 23:30 = slot 47)
+_TOU_HOME = np.full(48, 32.3719, dtype='float32')
+_TOU_MIDDAY = np.array([23.6916]*18 + [8.6151]*12 + [53.8446]*12 + [23.6916]*6, dtype='float32')
+_TOU_EV = np.array([19.3841]*12 +[23.6916]*6 + [8.6151]*12 + [53.8446]*12 + [23.6916]*4 + [19.3841]*2, dtype='float32')
+_TOU_PLANS = np.vstack([_TOU_HOME, _TOU_MIDDAY, _TOU_EV])
+_DEBS = np.array([2]*30 + [10]*12 + [2]*6, dtype='float32')
+
+# Daily supply charges per plan
+_SUPPLY = {'home_plan': 116.0505, 'midday_saver': 129.2269, 'electric_vehicle_add_on': 129.2269}
+
+def hash_bytes(b):
+  # Content hash for uploaded file bytes used as the cache key
+  return hashlib.blake2b(b, digest_size=16).hexdigest()
+
+# The readers are keyed on the content digest, the raw bytes are passed as unhashed
+# (underscore) arguments so Streamlit does not rehash multi-MB uploads on every rerun
+@st.cache_data(show_spinner=False)
+def read_synergy_csv(digest, _file_bytes):
+  # Peek at the header so only the columns present in this export are requested
+  header = pd.read_csv(io.BytesIO(_file_bytes), skiprows=5, nrows=0).columns
+  usecols = [c for c in ['Date', 'Time', 'Usage already billed', 'Usage not yet billed', 'Generation'] if c in header]
+  dtype = {
+    'Time': 'string',
+    'Usage already billed': 'float32',
+    'Usage not yet billed': 'float32',
+    'Generation': 'float32'
+  }
+  # The pyarrow engine ignores skiprows when a header row is given, so the preamble is skipped via header
+  data = pd.read_csv(
+    io.BytesIO(_file_bytes),
+    engine='pyarrow',
+    header=5,
+    usecols=usecols,
+    dtype={c: t for c, t in dtype.items() if c in usecols},
+    parse_dates=['Date'],
+    date_format='%d/%m/%Y'
+  )
+  # Pad 4 digit times (e.g., '0:30' to '00:30') and truncate the HH:MM:SS form pyarrow infers
+  # for fully padded exports, so the same half-hour matches across exports
+  data['Time'] = data['Time'].str.zfill(5).str[:5]
+  return data
+
+@st.cache_data(show_spinner=False)
+def read_sigenergy_xlsx(digest, _file_bytes):
+  return pd.read_excel(
+    io.BytesIO(_file_bytes),
+    sheet_name=0,
+    engine=XLSX_ENGINE,
+    usecols=['Date', 'Daily Solar Production (kWh)', 'Daily Consumption (kWh)', 'Daily From Grid (kWh)', 'Daily To Grid (kWh)']
+  )
+
+@st.cache_data(show_spinner=False)
+def load_synergy(digests, _file_bytes_tuple, deduplicate=True):
+  # Each file is parsed once, so adding an upload only reads the new file
+  synergy_list = [read_synergy_csv(d, b) for d, b in zip(digests, _file_bytes_tuple)]
+  data = pd.concat(synergy_list, ignore_index=True, copy=False)
+  # Overlapping exports repeat half-hours, keep the record from the last file
+  if deduplicate:
+    data = data.drop_duplicates(subset=['Date', 'Time'], keep='last')
+  return data
+
+@st.cache_data(show_spinner=False)
+def load_sigenergy(digests, _file_bytes_tuple, deduplicate=True):
+  sigenergy_list = [read_sigenergy_xlsx(d, b) for d, b in zip(digests, _file_bytes_tuple)]
+  data = pd.concat(sigenergy_list, ignore_index=True, copy=False)
+  # Likewise for repeated days
+  if deduplicate:
+    data = data.drop_duplicates(subset=['Date'], keep='last')
+  return data
 
 st.title("Synergy Half Hourly Data Analysis")
 st.markdown("This app allows you to upload Synergy half hourly data and Sigenergy solar data, and visualize the energy usage, generation, and costs associated with different plans.")
 
 with st.container(border=True):
   st.header("Input Synergy and Sigenergy Data")
+  deduplicate = st.toggle(
+    "Remove overlapping records across files",
+    value=True,
+    help="Turn off when the uploaded files cover non-overlapping date ranges to skip the duplicate check."
+  )
   # Import a file uploader
   uploaded_synergy_files = st.file_uploader(
     label = "Upload Synergy Half Hourly Data File(s)",
@@ -14,8 +99,8 @@ with st.container(border=True):
     type=["csv"]
   )
   if len(uploaded_synergy_files) > 0:
-    synergy_list = [pd.read_csv(f, skiprows=5) for f in uploaded_synergy_files]
-    synergy = pd.concat(synergy_list, ignore_index=True).drop_duplicates()
+    synergy_bytes = tuple(f.getvalue() for f in uploaded_synergy_files)
+    synergy = load_synergy(tuple(hash_bytes(b) for b in synergy_bytes), synergy_bytes, deduplicate)
     
     # Wrap this in a collapsed box
     with st.expander("View Data"):
@@ -30,13 +115,13 @@ with st.container(border=True):
 
   if len(uploaded_sigenergy_file) > 0:
     # Read the solar data file into a DataFrame
-    sigenergy_list = [pd.read_excel(f, sheet_name=0) for f in uploaded_sigenergy_file]
-    sigenergy = pd.concat(sigenergy_list, ignore_index=True).drop_duplicates()
+    sigenergy_bytes = tuple(f.getvalue() for f in uploaded_sigenergy_file)
+    sigenergy = load_sigenergy(tuple(hash_bytes(b) for b in sigenergy_bytes), sigenergy_bytes, deduplicate)
 
     # Wrap this in a collapsed box
     with st.expander("View Sigenergy Data"):
       # Display the DataFrame
-      st.write(sigenergy_list)
+      st.write(sigenergy)
 
 @st.cache_data(show_spinner=False)
 def process_synergy_data(data):
@@ -48,62 +133,49 @@ def process_synergy_data(data):
     data["Usage not yet billed"] = 0
     
   # Reorder columns
-  data = data[['Date', 'Time', 'Usage already billed', 'Usage not yet billed', 'Generation', 'Meter reading status']]
+  data = data[['Date', 'Time', 'Usage already billed', 'Usage not yet billed', 'Generation']]
 
   # Rename columns
-  data.columns = ['date', 'time', 'usage_1', 'usage_2', 'generation', 'meter_reading_status']
-  data.fillna({'usage_1': 0, 'usage_2': 0}, inplace=True)
-  data['syn_usage'] = data['usage_1'] + data['usage_2']
-  data = data[['date', 'time', 'syn_usage', 'generation']].rename(columns={'generation': 'syn_generation'})
-
-  # Format date
-  data.loc[:, 'date'] = pd.to_datetime(data['date'], format="%d/%m/%Y")
-  # Fix times that are 4 digits long (e.g., '0:30' to '00:30')
-  data.loc[:, 'time'] = [f"0{t}" if len(t)==4 else t for t in data['time']]
+  data.columns = ['date', 'time', 'usage_1', 'usage_2', 'generation']
+
+  # Build the half-hour columns in one step:
+  # - usage and generation as float32
+  # - time as a category, already HH:MM from read_synergy_csv and only 48 unique values
+  # - half-hour slot index (0-47) used to line usage up with the TOU rates
+  data = data.assign(
+    syn_usage=(data['usage_1'].fillna(0) + data['usage_2'].fillna(0)).astype('float32'),
+    syn_generation=data['generation'].astype('float32'),
+    time=data['time'].astype('category'),
+    slot=lambda d: d['time'].str[:2].astype('int8').to_numpy() * 2 + d['time'].str[3:5].astype('int8').to_numpy() // 30
+  )[['date', 'time', 'syn_usage', 'syn_generation', 'slot']]
+  if len(data['time'].cat.categories) > 48:
+    raise ValueError(f"Expected at most 48 half-hour times, found {len(data['time'].cat.categories)}")
   # Sort by date and time
   data.sort_values(['date', 'time'], inplace=True)
 
-  # Load other datasets
-  supply_charge = pd.DataFrame(
-    {
-      'plan': ['home_plan', 'midday_saver', 'electric_vehicle_add_on'],
-      'supply_charge': [116.0505, 129.2269, 129.2269]
-    }
-  )
-  tou_costs = pd.DataFrame(
-    {
-      'time': [f"{h:02d}:{m:02d}" for h in range(24) for m in (0, 30)],
-      'home_plan': 32.3719,
-      'midday_saver': [23.6916]*18 + [8.6151]*12 + [53.8446]*12 + [23.6916]*6,
-      'electric_vehicle_add_on': [19.3841]*12 +[23.6916]*6 + [8.6151]*12 + [53.8446]*12 + [23.6916]*4 + [19.3841]*2,
-      'debs': [2]*30 + [10]*12 + [2]*6,
-    }
-  )
-  tou_costs.loc[:, 'time'] = tou_costs['time'].apply(lambda x: x if len(x)==5 else '0'+x)
-
-  # Merge TOU costs
-  data = data.merge(tou_costs, on='time', how='left')
-
-  # Calculate cost columns
-  data.loc[:, 'home_plan_costs'] = data['home_plan'] * data['syn_usage']
-  data.loc[:, 'midday_saver_costs'] = data['midday_saver'] * data['syn_usage']
-  data.loc[:, 'electric_vehicle_add_on_costs'] = data['electric_vehicle_add_on'] * data['syn_usage']
-  data.loc[:, 'debs_feed_in_tariff'] = data['debs'] * data['syn_generation']
-
-  # Daily aggregation
-  data_daily = data.groupby('date').agg({
-    'syn_usage': 'sum',
-    'syn_generation': 'sum',
-    'home_plan_costs': 'sum',
-    'midday_saver_costs': 'sum',
-    'electric_vehicle_add_on_costs': 'sum',
-    'debs_feed_in_tariff': 'sum'
-  }).reset_index()
+  # Daily usage and generation per slot (days x 48), data is already sorted by date
+  pivot = data.groupby(['date', 'slot'], sort=False, observed=True)[['syn_usage', 'syn_generation']].sum().unstack('slot', fill_value=0)
+  usage = pivot['syn_usage'].reindex(columns=range(48), fill_value=0).to_numpy('float32')
+  generation = pivot['syn_generation'].reindex(columns=range(48), fill_value=0).to_numpy('float32')
+
+  # Daily costs as one matrix product over the plan rates
+  costs = usage @ _TOU_PLANS.T
+  data_daily = pd.DataFrame({
+    'date': pivot.index,
+    'syn_usage': usage.sum(axis=1),
+    'syn_generation': generation.sum(axis=1),
+    'home_plan_costs': costs[:, 0],
+    'midday_saver_costs': costs[:, 1],
+    'electric_vehicle_add_on_costs': costs[:, 2],
+    'debs_feed_in_tariff': generation @ _DEBS
+  })
 
   # Add supply charges
-  for plan in ['home_plan', 'midday_saver', 'electric_vehicle_add_on']:
-    charge = supply_charge.loc[supply_charge['plan'] == plan, 'supply_charge'].values[0]
-    data_daily[f'{plan}_costs'] += charge
+  data_daily[[f'{plan}_costs' for plan in _SUPPLY]] += np.array(list(_SUPPLY.values()), dtype='float32')
+
+  # Index by date so the UI can slice date ranges directly
+  data = data.set_index('date')
+  data_daily = data_daily.set_index('date').sort_index()
 
   return data, data_daily
 
@@ -112,16 +184,132 @@ def process_sigenergy_data(data):
   # Load solar data
   data = data[['Date', 'Daily Solar Production (kWh)', 'Daily Consumption (kWh)', 'Daily From Grid (kWh)', 'Daily To Grid (kWh)']]
   data.columns = ['date', 'sig_solar_production', 'sig_consumption', 'sig_from_grid', 'sig_to_grid']
-  data['date'] = pd.to_datetime(data['date'].astype(str), format='%Y%m%d')
-
-  # Calculations
-  data.loc[:, 'from_grid'] = data['sig_from_grid']
-  data.loc[:, 'to_grid'] = data['sig_to_grid']
-  data.loc[:, 'self_consumption'] = data['sig_consumption'] - data['sig_from_grid']
-  data.loc[:, 'total_usage'] = data['sig_consumption']
-  
+
+  # Format date and downcast to float32 in one step, derived columns are computed per date range in build_plot_frame
+  data = data.astype({c: 'float32' for c in data.columns[1:]}).assign(
+    date=lambda d: pd.to_datetime(d['date'].astype(str), format='%Y%m%d', exact=True, cache=True)
+  )
+
+  data = data.set_index('date').sort_index()
+
   return data
 
+def _slice_by_date(df, start, end):
+  # Binary search the sorted date index for the inclusive [start, end] rows
+  dates = df.index.values
+  i0 = np.searchsorted(dates, np.datetime64(start), side='left')
+  i1 = np.searchsorted(dates, np.datetime64(end), side='right')
+  return df.iloc[i0:i1]
+
+@st.cache_data(show_spinner=False)
+def build_plot_frame(daily_syn, daily_sig, start, end):
+  # Slice both daily frames to the date range and precompute the plotted series
+  syn = _slice_by_date(daily_syn, start, end)
+  sig = _slice_by_date(daily_sig, start, end)
+  frame = {
+    'syn_dates': syn.index,
+    'home_plan_costs': syn['home_plan_costs'].to_numpy(),
+    'midday_saver_costs': syn['midday_saver_costs'].to_numpy(),
+    'electric_vehicle_add_on_costs': syn['electric_vehicle_add_on_costs'].to_numpy(),
+    'debs_feed_in_tariff': syn['debs_feed_in_tariff'].to_numpy(),
+    'sig_dates': sig.index,
+    'sig_solar_production': sig['sig_solar_production'].to_numpy(),
+    'from_grid': sig['sig_from_grid'].to_numpy(),
+    'to_grid': sig['sig_to_grid'].to_numpy(),
+    'total_usage': sig['sig_consumption'].to_numpy()
+  }
+  frame['self_consumption'] = frame['total_usage'] - frame['from_grid']
+
+  # Percentages of usage and solar production, days with zero totals give inf/nan
+  with np.errstate(divide='ignore', invalid='ignore'):
+    frame['from_grid_pct'] = frame['from_grid'] / frame['total_usage'] * 100
+    frame['self_cons_pct'] = frame['self_consumption'] / frame['total_usage'] * 100
+    frame['to_grid_pct'] = frame['to_grid'] / frame['sig_solar_production'] * 100
+    frame['solar_self_cons_pct'] = (frame['sig_solar_production'] - frame['to_grid']) / frame['sig_solar_production'] * 100
+
+  # Range totals in a single pass over each frame
+  frame['cost_totals'] = syn[['home_plan_costs', 'midday_saver_costs', 'electric_vehicle_add_on_costs', 'debs_feed_in_tariff']].to_numpy(dtype='float32').sum(axis=0)
+  consumption, from_grid, solar_production = sig[['sig_consumption', 'sig_from_grid', 'sig_solar_production']].to_numpy(dtype='float32').sum(axis=0)
+  frame['energy_totals'] = np.array([consumption - from_grid, consumption, solar_production])
+
+  return frame
+
+@st.cache_resource(show_spinner=False)
+def build_range_figures(daily_syn, daily_sig, start, end):
+  # Build the date-range figures once per range, cache_resource hands back the same Figure objects
+  # without pickling them and st.plotly_chart serialises a Figure without re-validating it
+  frame = build_plot_frame(daily_syn, daily_sig, start, end)
+
+  fig_costs = go.Figure()
+  fig_costs.add_trace(go.Scattergl(x=frame['syn_dates'], y=frame['home_plan_costs'],
+                                name='Home Plan Costs', line=dict(color='blue')))
+  fig_costs.add_trace(go.Scattergl(x=frame['syn_dates'], y=frame['midday_saver_costs'],
+                                name='Midday Saver Costs', line=dict(color='orange')))
+  fig_costs.add_trace(go.Scattergl(x=frame['syn_dates'], y=frame['electric_vehicle_add_on_costs'],
+                                name='EV Add-On Costs', line=dict(color='green')))
+  fig_costs.update_layout(title="Daily Electricity Costs",
+                          xaxis_title="Date", yaxis_title="Cost (in currency units)",
+                          legend=dict(x=0.1, y=0.9), hovermode='x')
+
+  # Use plotly to plot stacked bar chart for from_grid, and self_consumption ####
+  fig_usage = go.Figure()
+  fig_usage.add_trace(go.Bar(x=frame['sig_dates'], y=frame['from_grid'],
+                            name='From Grid', marker_color='blue'))
+  fig_usage.add_trace(go.Bar(x=frame['sig_dates'], y=frame['self_consumption'],
+                            name='Self Consumption', marker_color='green'))
+  fig_usage.add_trace(go.Bar(x=frame['sig_dates'], y=-frame['to_grid'],
+                            name='To Grid', marker_color='orange'))
+  fig_usage.update_layout(title="Daily Energy Flow",
+                          xaxis_title="Date", yaxis_title="Energy (kWh)",
+                          barmode='relative', legend=dict(x=0.1, y=0.9), hovermode='x')
+
+  # Use plotly to plot 100% stacked bar chart for from_grid, and self_consumption ####
+  fig_usage_pct = go.Figure()
+  fig_usage_pct.add_trace(go.Bar(x=frame['sig_dates'], y=frame['from_grid_pct'],
+                                name='From Grid', marker_color='blue'))
+  fig_usage_pct.add_trace(go.Bar(x=frame['sig_dates'], y=frame['self_cons_pct'],
+                                name='Self Consumption', marker_color='green'))
+  fig_usage_pct.update_layout(title="Daily Energy Flow (Percentage)",
+                              xaxis_title="Date", yaxis_title="Percentage (%)",
+                              barmode='relative', legend=dict(x=0.1, y=0.9), hovermode='x')
+
+  # Use plotly to plot stacked bar chart for to_grid and self_consumption relative to sig_solar_production ####
+  fig_solar = go.Figure()
+  fig_solar.add_trace(go.Bar(x=frame['sig_dates'], y=frame['to_grid'],
+                            name='To Grid', marker_color='orange'))
+  fig_solar.add_trace(go.Bar(x=frame['sig_dates'], y=frame['self_consumption'],
+                            name='Self Consumption', marker_color='green'))
+  fig_solar.update_layout(title="Daily Solar Production Flow",
+                          xaxis_title="Date", yaxis_title="Energy (kWh)",
+                          barmode='relative', legend=dict(x=0.1, y=0.9), hovermode='x')
+
+  # Use plotly to plot 100% stacked bar chart for to_grid and self_consumption relative to sig_solar_production ####
+  fig_solar_pct = go.Figure()
+  fig_solar_pct.add_trace(go.Bar(x=frame['sig_dates'], y=frame['to_grid_pct'],
+                                name='To Grid', marker_color='orange'))
+  fig_solar_pct.add_trace(go.Bar(x=frame['sig_dates'], y=frame['solar_self_cons_pct'],
+                                name='Self Consumption', marker_color='green'))
+  fig_solar_pct.update_layout(title="Daily Solar Production Flow (Percentage)",
+                              xaxis_title="Date", yaxis_title="Percentage (%)",
+                              barmode='relative', legend=dict(x=0.1, y=0.9), hovermode='x')
+
+  # Use plotly to plot bar chart of to_grid ####
+  fig_to_grid = go.Figure()
+  fig_to_grid.add_trace(go.Bar(x=frame['sig_dates'], y=frame['to_grid'],
+                              name='To Grid', marker_color='orange'))
+  fig_to_grid.update_layout(title="Daily Energy Sent to Grid",
+                            xaxis_title="Date", yaxis_title="Energy (kWh)",
+                            legend=dict(x=0.1, y=0.9), hovermode='x')
+
+  return {
+    'costs': fig_costs,
+    'usage': fig_usage,
+    'usage_pct': fig_usage_pct,
+    'solar': fig_solar,
+    'solar_pct': fig_solar_pct,
+    'to_grid': fig_to_grid
+  }
+
 if len(uploaded_synergy_files) > 0 and len(uploaded_sigenergy_file) > 0:
   data_synergy_halfhour, data_synergy_daily = process_synergy_data(synergy)
   data_sigenergy_daily = process_sigenergy_data(sigenergy)
@@ -130,10 +318,11 @@ if len(uploaded_synergy_files) > 0 and len(uploaded_sigenergy_file) > 0:
 
   # Plotting functions
   def p_usage_line(input_date):
-    plot_data = data_synergy_halfhour[data_synergy_halfhour['date'] == pd.to_datetime(input_date)]
+    day = pd.Timestamp(input_date)
+    plot_data = _slice_by_date(data_synergy_halfhour, day, day)
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=plot_data['time'], y=plot_data['syn_usage'], mode='lines', name='From Grid', line=dict(color='blue')))
-    fig.add_trace(go.Scatter(x=plot_data['time'], y=plot_data['syn_generation'], mode='lines', name='To Grid', line=dict(color='orange')))
+    fig.add_trace(go.Scattergl(x=plot_data['time'], y=plot_data['syn_usage'], mode='lines', name='From Grid', line=dict(color='blue')))
+    fig.add_trace(go.Scattergl(x=plot_data['time'], y=plot_data['syn_generation'], mode='lines', name='To Grid', line=dict(color='orange')))
     fig.update_layout(
       title="Half Hourly Usage and Generation",
       xaxis_title="Time",
@@ -150,111 +339,43 @@ if len(uploaded_synergy_files) > 0 and len(uploaded_sigenergy_file) > 0:
   ):
     input_date = st.slider(
       "Select a date to view usage line plot",
-      min_value=data_synergy_halfhour['date'].min().date(),
-      max_value=data_synergy_halfhour['date'].max().date(),
-      value=data_synergy_halfhour['date'].min().date(),
+      min_value=data_synergy_halfhour.index.min().date(),
+      max_value=data_synergy_halfhour.index.max().date(),
+      value=data_synergy_halfhour.index.min().date(),
       format="YYYY-MM-DD"
     )
     if input_date:    
-      st.plotly_chart(p_usage_line(input_date.strftime('%Y-%m-%d')))
+      st.plotly_chart(p_usage_line(input_date))
 
   # Use plotly to plot line charts for costs ####
   with st.container(border=True):
     input_date_range = st.date_input(
       "Select a date range to view costs",
-      value=(data_synergy_daily['date'].min(), data_synergy_daily['date'].max())
+      value=(data_synergy_daily.index.min(), data_synergy_daily.index.max())
     )
-    data_synergy_daily_filtered = data_synergy_daily[
-      (data_synergy_daily['date'] >= pd.to_datetime(input_date_range[0])) &
-      (data_synergy_daily['date'] <= pd.to_datetime(input_date_range[1]))
-    ]
-
-    data_sigenergy_daily_filtered = data_sigenergy_daily[
-      (data_sigenergy_daily['date'] >= pd.to_datetime(input_date_range[0])) &
-      (data_sigenergy_daily['date'] <= pd.to_datetime(input_date_range[1]))
-    ]
-
-    st.write(f"Total Home Plan Costs: **${data_synergy_daily_filtered ['home_plan_costs'].sum() / 100:.2f}**")
-    st.write(f"Total Midday Saver Costs: **${data_synergy_daily_filtered['midday_saver_costs'].sum() / 100:.2f}**")
-    st.write(f"Total Electric Vehicle Add-On Costs: **${data_synergy_daily_filtered['electric_vehicle_add_on_costs'].sum() / 100:.2f}**")
-    st.write(f"Total Feed-In Tariff: **${data_synergy_daily_filtered['debs_feed_in_tariff'].sum() / 100:.2f}**")
-    st.write(f"Opportunity Cost from Self-Consumption: **${(data_sigenergy_daily_filtered['self_consumption'] * (32.3719 - 2)).sum() / 100:.2f}**")
-
-    fig_costs = go.Figure()
-    fig_costs.add_trace(go.Scatter(x=data_synergy_daily_filtered['date'], y=data_synergy_daily_filtered['home_plan_costs'],
-                                  name='Home Plan Costs', line=dict(color='blue')))
-    fig_costs.add_trace(go.Scatter(x=data_synergy_daily_filtered['date'], y=data_synergy_daily_filtered['midday_saver_costs'],
-                                  name='Midday Saver Costs', line=dict(color='orange')))
-    fig_costs.add_trace(go.Scatter(x=data_synergy_daily_filtered['date'], y=data_synergy_daily_filtered['electric_vehicle_add_on_costs'],
-                                  name='EV Add-On Costs', line=dict(color='green')))
-    fig_costs.update_layout(title="Daily Electricity Costs",
-                            xaxis_title="Date", yaxis_title="Cost (in currency units)",
-                            legend=dict(x=0.1, y=0.9), hovermode='x')
-    st.plotly_chart(fig_costs)
-
-    # Use plotly to plot stacked bar chart for from_grid, and self_consumption ####
-    fig_usage = go.Figure()
-    fig_usage.add_trace(go.Bar(x=data_sigenergy_daily_filtered['date'], y=data_sigenergy_daily_filtered['from_grid'],
-                              name='From Grid', marker_color='blue'))
-    fig_usage.add_trace(go.Bar(x=data_sigenergy_daily_filtered['date'], y=data_sigenergy_daily_filtered['self_consumption'],
-                              name='Self Consumption', marker_color='green'))
-    fig_usage.add_trace(go.Bar(x=data_sigenergy_daily_filtered['date'], y=-data_sigenergy_daily_filtered['to_grid'],
-                              name='To Grid', marker_color='orange'))
-    fig_usage.update_layout(title="Daily Energy Flow",
-                            xaxis_title="Date", yaxis_title="Energy (kWh)",
-                            barmode='relative', legend=dict(x=0.1, y=0.9), hovermode='x')
-    st.plotly_chart(fig_usage)
-
-    # Use plotly to plot 100% stacked bar chart for from_grid, and self_consumption ####
-    fig_usage_pct = go.Figure()
-    fig_usage_pct.add_trace(go.Bar(
-        x=data_sigenergy_daily_filtered['date'],
-        y=(data_sigenergy_daily_filtered['from_grid'] / data_sigenergy_daily_filtered['total_usage']) * 100,
-        name='From Grid', marker_color='blue'))
-    fig_usage_pct.add_trace(go.Bar(
-        x=data_sigenergy_daily_filtered['date'],
-        y=(data_sigenergy_daily_filtered['self_consumption'] / data_sigenergy_daily_filtered['total_usage']) * 100,
-        name='Self Consumption', marker_color='green'))
-    fig_usage_pct.update_layout(title="Daily Energy Flow (Percentage)",
-                                xaxis_title="Date", yaxis_title="Percentage (%)",
-                                barmode='relative', legend=dict(x=0.1, y=0.9), hovermode='x')
-    st.plotly_chart(fig_usage_pct)
-
-    st.write(f"Average Percentage from Self Consumption: **{data_sigenergy_daily_filtered['self_consumption'].sum() / data_sigenergy_daily_filtered['total_usage'].sum() * 100:.2f}%**")
-
-    # Use plotly to plot stacked bar chart for to_grid and self_consumption relative to sig_solar_production ####
-    fig_solar = go.Figure()
-    fig_solar.add_trace(go.Bar(x=data_sigenergy_daily_filtered['date'], y=data_sigenergy_daily_filtered['to_grid'],
-                              name='To Grid', marker_color='orange'))
-    fig_solar.add_trace(go.Bar(x=data_sigenergy_daily_filtered['date'], y=data_sigenergy_daily_filtered['self_consumption'],
-                              name='Self Consumption', marker_color='green'))
-    fig_solar.update_layout(title="Daily Solar Production Flow",
-                            xaxis_title="Date", yaxis_title="Energy (kWh)",
-                            barmode='relative', legend=dict(x=0.1, y=0.9), hovermode='x')
-    st.plotly_chart(fig_solar)
-
-    # Use plotly to plot 100% stacked bar chart for to_grid and self_consumption relative to sig_solar_production ####
-    fig_solar_pct = go.Figure()
-    fig_solar_pct.add_trace(go.Bar(
-        x=data_sigenergy_daily_filtered['date'],
-        y=(data_sigenergy_daily_filtered['to_grid'] / data_sigenergy_daily_filtered['sig_solar_production']) * 100,
-        name='To Grid', marker_color='orange'))
-    fig_solar_pct.add_trace(go.Bar(
-        x=data_sigenergy_daily_filtered['date'],
-        y=((data_sigenergy_daily_filtered['sig_solar_production'] - data_sigenergy_daily_filtered['to_grid']) / data_sigenergy_daily_filtered['sig_solar_production']) * 100,
-        name='Self Consumption', marker_color='green'))
-    fig_solar_pct.update_layout(title="Daily Solar Production Flow (Percentage)",
-                                xaxis_title="Date", yaxis_title="Percentage (%)",
-                                barmode='relative', legend=dict(x=0.1, y=0.9), hovermode='x')
-    st.plotly_chart(fig_solar_pct)
-        
-    st.write(f"Average Percentage to Self Consumption: **{data_sigenergy_daily_filtered['self_consumption'].sum() / data_sigenergy_daily_filtered['sig_solar_production'].sum() * 100:.2f}%**")
-
-    # Use plotly to plot bar chart of to_grid ####
-    fig_to_grid = go.Figure()
-    fig_to_grid.add_trace(go.Bar(x=data_sigenergy_daily_filtered['date'], y=data_sigenergy_daily_filtered['to_grid'],
-                                name='To Grid', marker_color='orange'))
-    fig_to_grid.update_layout(title="Daily Energy Sent to Grid",
-                              xaxis_title="Date", yaxis_title="Energy (kWh)",
-                              legend=dict(x=0.1, y=0.9), hovermode='x')
-    st.plotly_chart(fig_to_grid)
+    start = pd.Timestamp(input_date_range[0])
+    end = pd.Timestamp(input_date_range[1])
+    frame = build_plot_frame(data_synergy_daily, data_sigenergy_daily, start, end)
+
+    home_plan_total, midday_saver_total, ev_total, debs_total = frame['cost_totals'] / 100
+    self_consumption_total, total_usage_total, solar_production_total = frame['energy_totals']
+
+    st.write(f"Total Home Plan Costs: **${home_plan_total:.2f}**")
+    st.write(f"Total Midday Saver Costs: **${midday_saver_total:.2f}**")
+    st.write(f"Total Electric Vehicle Add-On Costs: **${ev_total:.2f}**")
+    st.write(f"Total Feed-In Tariff: **${debs_total:.2f}**")
+    st.write(f"Opportunity Cost from Self-Consumption: **${float(self_consumption_total) * (32.3719 - 2) / 100:.2f}**")
+
+    figures = build_range_figures(data_synergy_daily, data_sigenergy_daily, start, end)
+    st.plotly_chart(figures['costs'])
+    st.plotly_chart(figures['usage'])
+    st.plotly_chart(figures['usage_pct'])
+
+    st.write(f"Average Percentage from Self Consumption: **{self_consumption_total / total_usage_total * 100:.2f}%**")
+
+    st.plotly_chart(figures['solar'])
+    st.plotly_chart(figures['solar_pct'])
+
+    st.write(f"Average Percentage to Self Consumption: **{self_consumption_total / solar_production_total * 100:.2f}%**")
+
+    st.plotly_chart(figures['to_grid'])